@@ -1,86 +1,243 @@
 #!/usr/bin/env python3
+import asyncio
 import calendar
 import collections
+import concurrent.futures
 import datetime
+import gzip
+import io
 import os
 
-import bs4
+import httpx
+import lxml.etree
 import pandas as pd
-import requests
+import pyarrow as pa
+import pyarrow.csv as pacsv
 
 
 NEA_URL = (r'http://www.haze.gov.sg/haze-updates/historical-psi-readings/'
            r'year/{year}/month/{month}/day/{day}')
 
+# folder where downloaded day pages are kept, so reruns skip NEA
+CACHE_DIR = 'nea-cache'
+
+# NEA data is final only after this many days, newer pages are
+# neither cached nor skipped when already saved
+FINAL_AFTER_DAYS = 2
+
+# gzip level of cached pages, faster than the default 9 for little size cost
+CACHE_COMPRESSLEVEL = 6
+
+# seconds to wait for NEA to respond to a single day's request
+REQUEST_TIMEOUT = 30
+
+# times a day's request is retried after a timeout or a transient server
+# error, waiting RETRY_BACKOFF seconds first, doubled after each retry
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.3
+_RETRY_STATUSES = (500, 502, 503, 504)
+
+# NEA day pages are UTF-8, and the readings themselves are plain ASCII
+PAGE_ENCODING = 'utf-8'
+
+# maximum number of day pages downloaded from NEA at the same time
+MAX_CONCURRENT_REQUESTS = 20
+
+# maximum number of per-day CSV files written at the same time
+MAX_CONCURRENT_WRITES = 8
+
+# The PSI readings are
+# Time at 0
+# North at 1
+# South at 2
+# East at 3
+# West at 4
+# Central at 5
+# Overall at 6
+# The pattern is repeated for PM2.5 Concentration values
+_HEADERS_POST = (
+                'PSI-North',
+                'PSI-South',
+                'PSI-East',
+                'PSI-West',
+                'PSI-Central',
+                'PSI-Overall',
+                )
+_HEADERS_PRE = _HEADERS_POST + (
+                               'PM2.5-North',
+                               'PM2.5-South',
+                               'PM2.5-East',
+                               'PM2.5-West',
+                               'PM2.5-Central',
+                               'PM2.5-Overall',
+                               )
+
+# prior to 2014-04-01, there were PM2.5 readings
+# on 2014-04-01, PM2.5 readings were subsumed into PSI
+_PM_SUBSUME_DATE = datetime.date(2014, 4, 1)
+
+# one hour of readings, one field per _HEADERS_PRE column in that order,
+# e.g. 'PM2.5-North' -> pm25_north, the PM2.5 fields default to None for
+# pages without PM2.5 readings
+_Reading = collections.namedtuple(
+                                 '_Reading',
+                                 [
+                                  h.lower().replace('.', '').replace('-', '_')
+                                  for h in _HEADERS_PRE
+                                  ],
+                                 defaults=(None,) * (len(_HEADERS_PRE) -
+                                                     len(_HEADERS_POST))
+                                 )
+
+# NEA reports the overall readings as ranges, e.g. '55-60', so these are
+# kept as text; every other reading is a small integer
+_RANGE_HEADERS = ('PSI-Overall', 'PM2.5-Overall')
+
+# NEA hour_text to hour of the day, i.e. '1am' -> 1, '12pm' -> 12, '12am' -> 0
+_HOUR_MAP = {
+            '{}{}'.format(hour % 12 or 12, 'am' if hour < 12 else 'pm'): hour
+            for hour in range(24)
+            }
+
+# Singapore is UTC+8
+_SGT = datetime.timezone(datetime.timedelta(hours=8))
+
+
+class _TableTarget:
+    """
+    lxml parser target collecting the rows of the first table on a page.
+
+    close() returns a list of rows, each row a list of its td cell texts.
+    Everything outside the first table is skipped while parsing.
+    """
 
-def _get_nea_dict(url, dt_ymd):
+    def __init__(self):
+        self.rows = []
+        self._depth = 0  # table nesting depth, 0 outside the first table
+        self._done = False
+        self._row = None
+        self._cell = None
+
+    def start(self, tag, attrib):
+        if tag == 'table' and not self._done:
+            self._depth += 1
+        elif self._depth != 1:
+            return
+        elif tag == 'tr':
+            self._row = []
+            self.rows.append(self._row)
+        elif tag == 'td' and self._row is not None:
+            self._cell = []
+
+    def end(self, tag):
+        if tag == 'table' and self._depth > 0:
+            self._depth -= 1
+            self._done = self._depth == 0
+        elif self._depth != 1:
+            return
+        elif tag == 'td' and self._cell is not None:
+            self._row.append(''.join(self._cell))
+            self._cell = None
+        elif tag == 'tr':
+            self._row = None
+
+    def data(self, data):
+        if self._cell is not None:
+            self._cell.append(data)
+
+    def close(self):
+        return self.rows
+
+
+def _get_nea_rows(html, dt_ymd):
     """
-    Return (NEA PSI/PM2.5 data: OrderedDict, headers: list) for url.
+    Return NEA PSI/PM2.5 data for a day page.
 
-    May raise requests.exceptions.RequestException.
+    The data is a list of (hour_text, values) in the order reported by NEA.
+    Raises ValueError if the page has no readings, or a row is incomplete.
 
-    OrderedDict keys -- hour_text, '1am', '2am', '3pm' as reported by NEA
-    headers -- ordered list of data columns
+    hour_text -- '1am', '2am', '3pm', ...
+    values -- _Reading, int or None if missing,
+              text or None if missing for _RANGE_HEADERS
 
-    url -- NEA_URL with year, month, day substituted
+    html -- page downloaded from NEA_URL, as bytes
     dt_ymd -- datetime object with year, month, day
     """
-    result = collections.OrderedDict()
-
-    url = url.format(year=dt_ymd.year, month=dt_ymd.month, day=dt_ymd.day)
-    req = requests.get(url)
-    table = bs4.BeautifulSoup(req.text, 'lxml').find('table')
-    rows = table.findAll('tr')
-
-    # The PSI readings are
-    # Time at 0
-    # North at 1
-    # South at 2
-    # East at 3
-    # West at 4
-    # Central at 5
-    # Overall at 6
-    # The pattern is repeated for PM2.5 Concentration values
-
-    headers = [
-              'PSI-North',
-              'PSI-South',
-              'PSI-East',
-              'PSI-West',
-              'PSI-Central',
-              'PSI-Overall'
-              ]
-
-    # prior to 2014-04-01, there were PM2.5 readings
-    # on 2014-04-01, PM2.5 readings were subsumed into PSI
-    pm_subsume_date = datetime.datetime(2014, 4, 1)
-
-    if dt_ymd < pm_subsume_date:
-        headers += [
-                   'PM2.5-North',
-                   'PM2.5-South',
-                   'PM2.5-East',
-                   'PM2.5-West',
-                   'PM2.5-Central',
-                   'PM2.5-Overall',
-                   ]
+    result = []
+
+    # the raw bytes are parsed with a known encoding, nothing is decoded
+    # or detected beforehand
+    parser = lxml.etree.HTMLParser(
+                                  target=_TableTarget(),
+                                  encoding=PAGE_ENCODING
+                                  )
+    rows = lxml.etree.parse(io.BytesIO(html), parser)
+
+    headers = _HEADERS_POST
+    if dt_ymd.date() < _PM_SUBSUME_DATE:
+        headers = _HEADERS_PRE
+
+    # cell 0 holds hour_text, then one cell per header
+    converters = [
+                 (index, _to_range if header in _RANGE_HEADERS else _to_int)
+                 for index, header in enumerate(headers, 1)
+                 ]
 
     # Rows 0 and 1 are headers, skip
-    for i in range(2, len(rows)):
-        items = rows[i].findAll('td')
-        hour = items[0].text
-        result[hour] = collections.OrderedDict()
+    if len(rows) <= 2:
+        raise ValueError('No table of readings found')
+
+    num_cells = len(headers) + 1
+    for items in rows[2:]:
+        if len(items) < num_cells:
+            err_msg = 'Expected {} cells in a row, found {}: {}'
+            raise ValueError(err_msg.format(num_cells, len(items), items))
+
+        if items[0].strip().lower() not in _HOUR_MAP:
+            raise ValueError('Unknown hour {!r}'.format(items[0]))
+
+        values = _Reading(*[
+                           convert(items[index])
+                           for index, convert in converters
+                           ])
+        result.append((items[0], values))
 
-        for index, header in enumerate(headers, 1):
-            result[hour][header] = items[index].text.strip()
+    return result
 
-    return result, headers
+
+def _to_int(text):
+    """
+    Return a reading as int, or None if NEA marks it missing with '-'.
+    """
+    text = text.strip()
+    if text.isdigit():
+        return int(text)
+    return None
+
+
+def _to_range(text):
+    """
+    Return a range reading as text, or None if NEA marks it missing with '-'.
+    """
+    text = text.strip()
+    if text == '-':
+        return None
+    return text
+
+
+def _column_dtype(header):
+    """
+    Return the pandas dtype of a data column, see _RANGE_HEADERS.
+    """
+    if header in _RANGE_HEADERS:
+        return 'string'
+    return 'Int16'
 
 
 def _to_datetime(
         year, month, day,
         hour_text,
-        timezone='+0800'
+        timezone=_SGT
         ):
     """
     Return timezone-aware datetime with corrected day.
@@ -90,26 +247,299 @@ def _to_datetime(
     This function fixes that ambiguity by reporting the correct time.
 
     hour_text -- as of 2016, NEA displays it as '1am', '2am', '3pm', ...
-    timezone -- Singapore is UTC+8
+    timezone -- datetime.tzinfo, Singapore is UTC+8
     """
-    date_string = '{year}-{month}-{day} {hour_text} {timezone}'
-
-    date_string = date_string.format(
-                                    year=year,
-                                    month=month,
-                                    day=day,
-                                    hour_text=hour_text,
-                                    timezone=timezone
-                                    )
-    dt = datetime.datetime.strptime(date_string, '%Y-%m-%d %I%p %z')
+    hour = _HOUR_MAP[hour_text.strip().lower()]
+    dt = datetime.datetime(year, month, day, hour, tzinfo=timezone)
 
     # see docstring, we correct NEA
-    if dt.hour == 0:
+    if hour == 0:
         dt = dt + datetime.timedelta(days=1)
 
     return dt
 
 
+def _is_final(day):
+    """
+    Return True if NEA will no longer update the readings of day.
+
+    day -- date object
+    """
+    # e.g. with FINAL_AFTER_DAYS = 2, only today and yesterday may change
+    last_final_day = (datetime.date.today() -
+                      datetime.timedelta(days=FINAL_AFTER_DAYS))
+    return day <= last_final_day
+
+
+def _cache_path(cache_dir, dt_ymd):
+    """
+    Return the cache file for a day page, or None if it should not be cached.
+
+    cache_dir -- cache folder, None to disable caching
+    dt_ymd -- datetime object with year, month, day
+    """
+    if cache_dir is None or not _is_final(dt_ymd.date()):
+        return None
+
+    short_date = '{}.html.gz'.format(str(dt_ymd.date()))
+    return os.path.join(cache_dir, short_date)
+
+
+def _write_cache(cache_path, html):
+    """
+    Save a downloaded day page into the cache.
+
+    The page is written under a temporary name first,
+    so an interrupted run never leaves a truncated cache file behind.
+    """
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+
+    tmp_path = cache_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(gzip.compress(html, compresslevel=CACHE_COMPRESSLEVEL))
+    os.replace(tmp_path, cache_path)
+
+
+def _read_cached_page(cache_path, dt_ymd):
+    """
+    Return _get_nea_rows for a cached day page, or None if it is not cached.
+
+    A cache file that is corrupt or does not parse counts as not cached,
+    so the page is downloaded again.
+
+    cache_path -- see _cache_path
+    dt_ymd -- datetime object with year, month, day
+    """
+    try:
+        with open(cache_path, 'rb') as f:
+            html = gzip.decompress(f.read())
+        return _get_nea_rows(html, dt_ymd)
+
+    # missing files and gzip.BadGzipFile are both OSErrors,
+    # truncated files raise EOFError
+    except (OSError, EOFError, ValueError, lxml.etree.LxmlError):
+        return None
+
+
+def _parse_page(html, dt_ymd, cache_path=None):
+    """
+    Return _get_nea_rows for a downloaded day page, caching it if it parses.
+
+    Pages that fail to parse or hold no readings are not cached,
+    so they are downloaded again on the next run.
+
+    cache_path -- see _cache_path, None to not cache the page
+    """
+    result = _get_nea_rows(html, dt_ymd)
+
+    if cache_path is not None and result:
+        _write_cache(cache_path, html)
+
+    return result
+
+
+async def _get_page(client, semaphore, url):
+    """
+    Return the body of url as bytes.
+
+    Timeouts and transient server errors are retried with backoff,
+    connection errors are retried by the client's transport.
+    May raise httpx.HTTPError.
+
+    client -- httpx.AsyncClient
+    semaphore -- asyncio.Semaphore capping concurrent requests
+    """
+    for attempt in range(MAX_RETRIES + 1):
+        last_attempt = attempt == MAX_RETRIES
+
+        try:
+            async with semaphore:
+                resp = await client.get(url)
+
+        except httpx.TimeoutException:
+            if last_attempt:
+                raise
+
+        else:
+            if last_attempt or resp.status_code not in _RETRY_STATUSES:
+                resp.raise_for_status()
+                return resp.content
+
+        await asyncio.sleep(RETRY_BACKOFF * 2 ** attempt)
+
+
+async def _fetch_day(client, semaphore, url, dt_ymd, cache_dir=None):
+    """
+    Return NEA PSI/PM2.5 data as per _get_nea_rows for one day.
+
+    Download and parse errors are printed and None is returned instead,
+    so that one bad day does not abort the rest of the download.
+
+    client -- httpx.AsyncClient
+    semaphore -- asyncio.Semaphore capping concurrent requests
+    url -- NEA_URL
+    dt_ymd -- datetime object with year, month, day
+    cache_dir -- folder caching day pages, see _cache_path
+    """
+    # file access, (de)compression and parsing all block,
+    # keep them off the event loop
+    loop = asyncio.get_running_loop()
+    cache_path = _cache_path(cache_dir, dt_ymd)
+    url = url.format(year=dt_ymd.year, month=dt_ymd.month, day=dt_ymd.day)
+
+    try:
+        if cache_path is not None:
+            page = await loop.run_in_executor(
+                                             None,
+                                             _read_cached_page,
+                                             cache_path, dt_ymd
+                                             )
+            if page is not None:
+                return page
+
+        html = await _get_page(client, semaphore, url)
+
+        return await loop.run_in_executor(
+                                         None,
+                                         _parse_page,
+                                         html, dt_ymd, cache_path
+                                         )
+
+    except (httpx.HTTPError, ValueError, lxml.etree.LxmlError) as e:
+        err_msg = 'Error for {}-{}-{}: {}\n'
+        err_msg = err_msg.format(dt_ymd.year, dt_ymd.month, dt_ymd.day, str(e))
+        print(err_msg)
+        return None
+
+
+async def _download_pages(base_url, days, verbose, cache_dir=None):
+    """
+    Return a list of _fetch_day results, in the same order as days.
+
+    Each result is the NEA PSI/PM2.5 data of a day, or None if it failed.
+
+    base_url -- NEA_URL
+    days -- list of datetime objects with year, month, day
+    verbose -- True to print every time a month is complete
+    cache_dir -- folder caching day pages, see _cache_path
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    limits = httpx.Limits(
+                         max_connections=MAX_CONCURRENT_REQUESTS,
+                         max_keepalive_connections=MAX_CONCURRENT_REQUESTS
+                         )
+    transport = httpx.AsyncHTTPTransport(
+                                        http2=True,
+                                        limits=limits,
+                                        retries=MAX_RETRIES
+                                        )
+    headers = {'User-Agent': 'singapore-nea-psi'}
+
+    # days left to download per (year, month)
+    remaining = collections.Counter((d.year, d.month) for d in days)
+
+    async def fetch(client, dt_ymd):
+        page = await _fetch_day(
+                               client, semaphore, base_url, dt_ymd,
+                               cache_dir
+                               )
+
+        month = (dt_ymd.year, dt_ymd.month)
+        remaining[month] -= 1
+        if verbose and remaining[month] == 0:
+            print("Processed {}-{}".format(*month))
+
+        return page
+
+    # HTTP/2 multiplexes the requests over a few connections where the
+    # server supports it, otherwise httpx falls back to HTTP/1.1
+    async with httpx.AsyncClient(
+                                transport=transport,
+                                timeout=REQUEST_TIMEOUT,
+                                headers=headers,
+                                follow_redirects=True
+                                ) as client:
+        return await asyncio.gather(*[fetch(client, d) for d in days])
+
+
+def _saved_days(save_folder):
+    """
+    Return the set of dates already saved by _save_csv_per_day.
+
+    save_folder -- CSV save folder, None if not saving per day
+    """
+    if save_folder is None or not os.path.isdir(save_folder):
+        return set()
+
+    result = set()
+    for file_name in os.listdir(save_folder):
+        short_date, ext = os.path.splitext(file_name)
+        if ext != '.csv':
+            continue
+
+        try:
+            result.add(datetime.date.fromisoformat(short_date))
+        except ValueError:
+            pass
+
+    return result
+
+
+def _read_saved_pages(save_folder, page_days, headers):
+    """
+    Return (NEA PSI/PM2.5 data: dataframe, days: set) of saved day pages.
+
+    A day page counts as saved only once all of its readings are,
+    i.e. 1am to 12am, so pages that failed to download are fetched again.
+    Note that a day page's 12am reading is saved with the next day,
+    see _to_datetime, so both days' CSV files are read.
+
+    data -- readings of the saved day pages, None if there are none
+    days -- date objects of the saved day pages
+
+    save_folder -- CSV save folder, None if not saving per day
+    page_days -- date objects, days whose NEA pages to look for
+    headers -- ordered data columns of the returned dataframe
+    """
+    saved_files = _saved_days(save_folder)
+    one_day = datetime.timedelta(days=1)
+
+    candidates = {
+                 day for day in page_days
+                 if day in saved_files and day + one_day in saved_files
+                 }
+    if not candidates:
+        return None, set()
+
+    frames = []
+    for day in sorted(candidates | {day + one_day for day in candidates}):
+        short_date = '{}.csv'.format(str(day))
+
+        # files saved before readings were stored as numbers mark missing
+        # readings with '-', as on the NEA website
+        frames.append(pd.read_csv(
+                                 os.path.join(save_folder, short_date),
+                                 index_col='Timestamp',
+                                 parse_dates=True,
+                                 na_values=['-']
+                                 ))
+
+    dtypes = {header: _column_dtype(header) for header in headers}
+    df = pd.concat(frames).reindex(columns=headers).astype(dtypes)
+    df = df[~df.index.duplicated()]
+
+    # count the readings of each candidate page, a reading at time t was
+    # reported on the page of (t - 1 hour)'s day
+    page_of = pd.Series((df.index - pd.Timedelta(hours=1)).date)
+    counts = page_of[page_of.isin(candidates)].value_counts()
+    saved_pages = set(counts.index[counts == len(_HOUR_MAP)])
+
+    if not saved_pages:
+        return None, set()
+
+    return df[page_of.isin(saved_pages).to_numpy()], saved_pages
+
+
 def _download_df(
                 base_url,
                 year_start=2010,
@@ -118,7 +548,9 @@ def _download_df(
                 month_end=12,
                 day_start=1,
                 day_end=None,
-                verbose=True
+                verbose=True,
+                cache_dir=None,
+                save_folder=None
                 ):
     """
     Return a dataframe containing PSI and/or PM2.5 readings.
@@ -128,20 +560,21 @@ def _download_df(
     base_url -- NEA_URL
     all other date parameters are inclusive [start, end]
     verbose -- True to print every time a month is complete
+    cache_dir -- folder caching day pages, None to always download
+    save_folder -- per-day CSV folder of an earlier run, its final days are
+                   read back instead of downloaded, None to download all
     """
-    result_odict = {}
-    df_headers = []
+    timestamps = []
+    rows = []
 
     today = datetime.datetime.now()
 
     if year_end is None:
         year_end = today.year
 
+    days = []
     for year in range(year_start, year_end + 1):
         for month in range(month_start, month_end + 1):
-            if verbose:
-                print("Processing {}-{}".format(year, month))
-
             _, num_days = calendar.monthrange(year, month)
 
             first_day = 1
@@ -157,50 +590,126 @@ def _download_df(
                 last_day = day_end
 
             for day in range(first_day, last_day + 1):
+                days.append(datetime.datetime(year, month, day))
+
+    # the PM2.5 columns exist whenever the range starts before they were
+    # subsumed into PSI
+    df_headers = _HEADERS_POST
+    if days and days[0].date() < _PM_SUBSUME_DATE:
+        df_headers = _HEADERS_PRE
+
+    saved_df, saved_pages = _read_saved_pages(
+                                             save_folder,
+                                             [d.date() for d in days
+                                              if _is_final(d.date())],
+                                             df_headers
+                                             )
+
+    if verbose and saved_pages:
+        print("Skipping {} days saved in {}".format(
+                                                   len(saved_pages),
+                                                   save_folder
+                                                   ))
+
+    days = [d for d in days if d.date() not in saved_pages]
+    pages = asyncio.run(_download_pages(base_url, days, verbose, cache_dir))
+
+    for ymd, data in zip(days, pages):
+        if data is None:
+            continue
+
+        for hour_text, values in data:
+            timestamp = _to_datetime(ymd.year, ymd.month, ymd.day, hour_text)
+            timestamps.append(timestamp)
+            rows.append(values)
+
+    # build column by column, every _Reading has all _HEADERS_PRE fields,
+    # of which the first len(df_headers) are kept
+    columns = list(zip(*rows)) or [()] * len(df_headers)
+
+    data = {
+           header: pd.array(column, dtype=_column_dtype(header))
+           for header, column in zip(df_headers, columns)
+           }
+
+    df = pd.DataFrame(
+                     data,
+                     index=pd.DatetimeIndex(timestamps, name='Timestamp')
+                     )
+
+    if saved_pages:
+        # pandas warns about concatenating an empty frame
+        frames = [saved_df] if df.empty else [df, saved_df]
+        df = pd.concat(frames).sort_index()
+
+    return df
 
-                try:
-                    ymd = datetime.datetime(year, month, day)
-                    data, headers = _get_nea_dict(base_url, ymd)
-                    if len(headers) > len(df_headers):
-                        df_headers = headers
 
-                    for hour_text in data:
-                        timestamp = _to_datetime(year, month, day, hour_text)
-                        result_odict[timestamp] = data[hour_text]
+def _to_arrow_table(df):
+    """
+    Return the dataframe as a pyarrow.Table, with a leading Timestamp column.
+
+    Timestamps are kept to the second, e.g. 2016-01-01 01:00:00+0800.
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False)
 
-                except requests.exceptions.RequestException as e:
-                    err_msg = 'Error for {}-{}-{}: {}\n'
-                    err_msg = err_msg.format(year, month, day, str(e))
-                    print(err_msg)
+    index = pa.array(df.index)
+    index = index.cast(pa.timestamp('s', tz=index.type.tz))
 
-    df = pd.DataFrame.from_dict(result_odict, orient='index')
-    df = df[df_headers]
-    return df
+    return table.add_column(0, 'Timestamp', index)
+
+
+def _save_csv(df, file_name):
+    """
+    Save the dataframe data into a single CSV file.
+
+    file_name -- CSV file name
+    """
+    pacsv.write_csv(_to_arrow_table(df), file_name)
 
 
 def _save_csv_per_day(df, save_folder):
     """
-    Save the dataframe data per day into individual CSV files. Sorts dataframe.
+    Save the dataframe data per day into individual CSV files, sorted by time.
 
     save_folder -- CSV save folder
     """
     os.makedirs(save_folder, exist_ok=True)
-    df.sort_index()
 
-    curr_day = df.index.min()
-    last_day = df.index.max()
+    # _download_df already returns readings in time order
+    if not df.index.is_monotonic_increasing:
+        df = df.sort_index()
+
+    table = _to_arrow_table(df)
+
+    # the local midnight of each timestamp identifies its day,
+    # and each day is a contiguous run of rows in a sorted index
+    day_keys = df.index.normalize()
+    days = day_keys.unique()
+    starts = day_keys.searchsorted(days)
+    ends = list(starts[1:]) + [len(df)]
+
+    with concurrent.futures.ThreadPoolExecutor(
+                                        max_workers=MAX_CONCURRENT_WRITES
+                                        ) as pool:
+        futures = []
 
-    while curr_day <= last_day:
-        curr = curr_day.replace(hour=0)
-        until = curr_day.replace(hour=23)
-        short_date = '{}.csv'.format(str(curr.date()))
-        file_name = os.path.join(save_folder, short_date)
+        for day, start, end in zip(days, starts, ends):
+            short_date = '{}.csv'.format(str(day.date()))
+            file_name = os.path.join(save_folder, short_date)
 
-        df[curr:until].to_csv(file_name, index_label='Timestamp')
-        curr_day = curr_day + datetime.timedelta(days=1)
+            futures.append(pool.submit(
+                                      pacsv.write_csv,
+                                      table.slice(start, end - start),
+                                      file_name
+                                      ))
 
+    # re-raise the first error, if any
+    for future in futures:
+        future.result()
 
-def main(base_url):
+
+def main(base_url, cache_dir):
     print('This will download PSI/PM2.5 readings published by NEA Singapore.')
     print('This may utilize significant amounts of bandwidth.')
     print()
@@ -242,19 +751,27 @@ def main(base_url):
                    '1. pickled dataframe\n'
                    '2. csv (all)\n'
                    '3. csv (per day)\n'
+                   '4. parquet\n'
                    'You may make multiple choices,\n'
                    'e.g. "1 3" without quotes\n\n'
                    'Choice > ')
     print()
     save_options = choice.split()
 
+    # days already saved per day by an earlier run are not downloaded again
+    save_folder = None
+    if '3' in save_options:
+        save_folder = filename
+
     print('Now downloading, please wait.')
     df = _download_df(
                     base_url,
                     year_start, year_end,
                     month_start, month_end,
                     day_start, day_end,
-                    verbose
+                    verbose,
+                    cache_dir,
+                    save_folder
                     )
     print('Finished downloading.')
     print('Please check the above output for error messages, if any.\n')
@@ -262,11 +779,17 @@ def main(base_url):
     if '1' in save_options:
         df.to_pickle('{}.pickle'.format(filename))
     if '2' in save_options:
-        df.to_csv('{}.csv'.format(filename))
+        _save_csv(df, '{}.csv'.format(filename))
     if '3' in save_options:
         _save_csv_per_day(df, filename)
+    if '4' in save_options:
+        df.to_parquet(
+                     '{}.parquet'.format(filename),
+                     engine='pyarrow',
+                     compression='zstd'
+                     )
 
     print('Files saved. Please check the folder this script is in.')
 
 if __name__ == '__main__':
-    main(NEA_URL)
+    main(NEA_URL, CACHE_DIR)
@@ -0,0 +1,201 @@
+import asyncio
+import datetime
+import os
+
+import httpx
+import pandas as pd
+import pytest
+
+import psi_scraper
+
+
+HEADER = 'Timestamp,' + ','.join(psi_scraper._HEADERS_PRE)
+
+
+def _write_day(folder, day, hours, values):
+    """
+    Write a per-day CSV in the format of datasets/sg-nea-psi.zip.
+
+    hours -- hours of the day to write a row for
+    values -- the row's readings after the timestamp, as text
+    """
+    lines = [HEADER]
+    for hour in hours:
+        lines.append('{} {:02d}:00:00+08:00,{}'.format(day, hour, values))
+
+    path = folder / '{}.csv'.format(day)
+    path.write_text('\n'.join(lines) + '\n')
+
+
+def test_read_saved_pages_baseline_format(tmp_path):
+    day = datetime.date(2016, 1, 1)
+    next_day = day + datetime.timedelta(days=1)
+
+    _write_day(tmp_path, day, range(24), '-,2,3,4,5,55-60' + ',-' * 6)
+    _write_day(tmp_path, next_day, [0], '1,2,3,4,5,-' + ',-' * 6)
+
+    df, saved = psi_scraper._read_saved_pages(
+                                              str(tmp_path),
+                                              [day],
+                                              psi_scraper._HEADERS_POST
+                                              )
+
+    assert saved == {day}
+    assert list(df.columns) == list(psi_scraper._HEADERS_POST)
+
+    # 1am of day up to 12am, reported as 00:00 of the next day
+    assert len(df) == 24
+    assert df.index[0] == pd.Timestamp('2016-01-01 01:00', tz='+08:00')
+    assert df.index[-1] == pd.Timestamp('2016-01-02 00:00', tz='+08:00')
+
+    assert str(df['PSI-North'].dtype) == 'Int16'
+    assert df['PSI-North'].isna().sum() == 23
+    assert df['PSI-South'].iloc[0] == 2
+    assert df['PSI-Overall'].iloc[0] == '55-60'
+    assert pd.isna(df['PSI-Overall'].iloc[-1])
+
+
+def test_read_saved_pages_skips_failed_page(tmp_path):
+    days = [datetime.date(2016, 1, d) for d in (1, 2, 3)]
+    values = '1,2,3,4,5,1-5' + ',-' * 6
+
+    # the page of 2016-01-02 failed to download, so its file only holds
+    # the 12am reading of the page before
+    _write_day(tmp_path, days[0], range(1, 24), values)
+    _write_day(tmp_path, days[1], [0], values)
+    _write_day(tmp_path, days[2], range(1, 24), values)
+    _write_day(tmp_path, days[2] + datetime.timedelta(days=1), [0], values)
+
+    df, saved = psi_scraper._read_saved_pages(
+                                              str(tmp_path),
+                                              days,
+                                              psi_scraper._HEADERS_PRE
+                                              )
+
+    assert saved == {days[0], days[2]}
+    assert len(df) == 48
+    assert df.loc['2016-01-02 01:00':'2016-01-03 00:00'].empty
+
+
+def test_get_nea_rows_rejects_pages_without_readings():
+    dt_ymd = datetime.datetime(2016, 1, 1)
+    header_rows = '<tr><td>Time</td></tr><tr><td>PSI</td></tr>'
+
+    pages = [
+            b'<html><body>Under maintenance</body></html>',
+            '<table>{}</table>'.format(header_rows).encode(),
+            '<table>{}<tr><td>No data</td></tr></table>'.format(
+                                                            header_rows
+                                                            ).encode(),
+            ]
+
+    for html in pages:
+        with pytest.raises(ValueError):
+            psi_scraper._get_nea_rows(html, dt_ymd)
+
+
+def _run_with_pages(coroutine_function, handler):
+    """
+    Return the result of coroutine_function(client, semaphore).
+
+    The client serves every request through handler, see httpx.MockTransport.
+    """
+    async def run():
+        transport = httpx.MockTransport(handler)
+        async with httpx.AsyncClient(transport=transport) as client:
+            return await coroutine_function(client, asyncio.Semaphore(1))
+
+    return asyncio.run(run())
+
+
+def test_fetch_day_reports_unparsable_page(capsys):
+    dt_ymd = datetime.datetime(2016, 1, 1)
+
+    def handler(request):
+        return httpx.Response(200, content=b'<html>Under maintenance</html>')
+
+    async def fetch(client, semaphore):
+        return await psi_scraper._fetch_day(
+                                           client, semaphore,
+                                           psi_scraper.NEA_URL, dt_ymd
+                                           )
+
+    page = _run_with_pages(fetch, handler)
+
+    assert page is None
+    assert 'Error for 2016-1-1' in capsys.readouterr().out
+
+
+def test_fetch_day_caches_only_parsed_pages(tmp_path):
+    dt_ymd = datetime.datetime(2016, 1, 1)
+    cache_path = psi_scraper._cache_path(str(tmp_path), dt_ymd)
+    pages = [b'<html>Under maintenance</html>']
+
+    def handler(request):
+        return httpx.Response(200, content=pages[0])
+
+    async def fetch(client, semaphore):
+        return await psi_scraper._fetch_day(
+                                           client, semaphore,
+                                           psi_scraper.NEA_URL, dt_ymd,
+                                           str(tmp_path)
+                                           )
+
+    assert _run_with_pages(fetch, handler) is None
+    assert not os.path.exists(cache_path)
+
+    # a corrupt cache file is downloaded again, then replaced
+    with open(cache_path, 'wb') as f:
+        f.write(b'not gzip')
+
+    pages[0] = (
+               b'<table><tr><td>Time</td></tr><tr><td>PSI</td></tr>'
+               b'<tr><td>1am</td><td>1</td><td>2</td><td>3</td><td>4</td>'
+               b'<td>5</td><td>1-5</td></tr></table>'
+               )
+
+    page = _run_with_pages(fetch, handler)
+    assert [hour_text for hour_text, _ in page] == ['1am']
+    assert psi_scraper._read_cached_page(cache_path, dt_ymd) == page
+
+
+def test_get_page_retries(monkeypatch):
+    monkeypatch.setattr(psi_scraper, 'RETRY_BACKOFF', 0)
+    url = 'http://nea.test/'
+
+    def serve(responses):
+        """
+        Return (handler, requests) answering with responses in turn.
+
+        responses -- HTTP status codes, or None to time out
+        """
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            status = responses[min(len(requests), len(responses)) - 1]
+            if status is None:
+                raise httpx.ReadTimeout('Timed out', request=request)
+            return httpx.Response(status, content=b'page')
+
+        return handler, requests
+
+    async def get(client, semaphore):
+        return await psi_scraper._get_page(client, semaphore, url)
+
+    # a transient server error is retried
+    handler, requests = serve([503, 200])
+    assert _run_with_pages(get, handler) == b'page'
+    assert len(requests) == 2
+
+    # a client error fails at once
+    handler, requests = serve([404])
+    with pytest.raises(httpx.HTTPStatusError):
+        _run_with_pages(get, handler)
+    assert len(requests) == 1
+
+    # a timeout on the last attempt is raised
+    handler, requests = serve([None])
+    with pytest.raises(httpx.TimeoutException):
+        _run_with_pages(get, handler)
+    assert len(requests) == psi_scraper.MAX_RETRIES + 1